@@ -25,6 +25,31 @@ PROXIES = [
     # "http://192.168.1.1:8888",              # Example without auth
 ]
 
+# --- Concurrency ---
+# Contacts are split across SCORING_PROCESSES worker processes (None = one per CPU core).
+# Each process scores CONTACT_WORKERS contacts at the same time, running the network
+# lookups (Zillow, website, social media) for each contact ENRICHMENT_WORKERS at a time.
+# Higher values finish faster but make rate limiting and IP bans more likely.
+SCORING_PROCESSES = 4
+CONTACT_WORKERS = 4
+ENRICHMENT_WORKERS = 3
+
+# Input CSVs are read, cleaned and scored this many rows at a time, so only one chunk of
+# raw input is held at once and scoring starts before the whole file is parsed. Results
+# are still kept for every row and sorted at the end, and the USA check reads the file's
+# text columns once up front, so total memory still grows with the size of the lead list.
+INPUT_CHUNK_SIZE = 1000
+
+# Leads whose bio + category score is below this, and that have no website or
+# username to look up, skip the network enrichment (Zillow, website, social media).
+ENRICHMENT_MIN_CHEAP_SCORE = 5
+
+# --- Response Caching ---
+# Fetched lead websites are cached on disk for WEB_CACHE_EXPIRE_HOURS so re-runs don't
+# download them again (needs the optional requests-cache package). None disables it.
+WEB_CACHE_PATH = 'cache/web_scraper'
+WEB_CACHE_EXPIRE_HOURS = 24
+
 ZILLOW_ZUID = "" # <--- PASTE YOUR ZUID VALUE HERE
 # --- Enrichment Service Preferences ---
 
@@ -99,11 +124,11 @@ WEBSITE_KEYWORDS = [
 ]
 
 # User agents for web scraping to avoid being blocked
-USER_AGENTS = [
+USER_AGENTS = (
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0'
-]
+)
 
 # Common disposable email domains for validation
 DISPOSABLE_DOMAINS = [
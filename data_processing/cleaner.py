@@ -1,79 +1,115 @@
 # wholesale_lead_analyzer/data_processing/cleaner.py
 
+import numpy as np
 import pandas as pd
 import re
 import logging
+import importlib.util
 from typing import Optional
 from configs import settings # Import the settings module
 
 logger = logging.getLogger(__name__)
 
+# Free-text columns held as Arrow-backed strings when pyarrow is installed, so the
+# .str operations in cleaning and scoring run in Arrow's vectorized kernels.
+TEXT_COLUMNS = ['bio', 'category', 'name', 'website']
+TEXT_DTYPE = 'string[pyarrow]' if importlib.util.find_spec('pyarrow') else None
+
+# USA indicators patterns, combined into a single alternation compiled once at import.
+# State abbreviations are checked separately (see US_STATE_CODES below).
+USA_PATTERNS = [
+    r'\b(?:USA|US|United States|America|American)\b',
+    r'\b\d{5}(?:-\d{4})?\b',  # ZIP codes
+    r'\+?1[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US phone format
+    r'\b(?:California|Texas|Florida|New York|Illinois|Pennsylvania|Ohio|Georgia|North Carolina|Michigan)\b'
+]
+USA_PATTERN = re.compile('|'.join(USA_PATTERNS), re.IGNORECASE)
+
+# Rather than a 50-way alternation, pull out every standalone two-letter word with
+# one character-class match and look it up in a set (case-insensitive, as above).
+STATE_CODE_CANDIDATE_RE = re.compile(r'\b([A-Za-z]{2})\b')
+US_STATE_CODES = frozenset({
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY',
+    'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND',
+    'OH', 'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY',
+})
+
+# Enhanced USA phone pattern: the optional country code covers both the +1 and
+# bare 10-digit forms in a single pass. Both patterns have a single capture group
+# so they can be fed straight to Series.str.extract.
+PHONE_RE = re.compile(r'((?:\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}|\d{10})')
+EMAIL_RE = re.compile(r'(\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)')
+
+def as_text(column: pd.Series) -> pd.Series:
+    """Returns column with missing values as '', keeping a pandas string dtype if it has one."""
+    column = column.fillna('')
+    return column if isinstance(column.dtype, pd.StringDtype) else column.astype(str)
+
 class DataCleaner:
     """Cleans and prepares raw lead data for analysis."""
 
-    def clean_contact_data(self, raw_data: pd.DataFrame) -> pd.DataFrame:
-        """Clean and standardize input data, with optional USA filtering."""
+    def clean_contact_data(self, raw_data: pd.DataFrame,
+                           file_has_usa_indicators: Optional[bool] = None) -> pd.DataFrame:
+        """
+        Clean and standardize input data, with optional USA filtering.
+
+        When raw_data is one chunk of a larger file, pass file_has_usa_indicators (see
+        usa_indicator_mask) so the keep-everything fallback is decided for the whole file.
+        """
         logger.info("Starting data cleaning process...")
         data = raw_data.copy()
+        if TEXT_DTYPE is not None:
+            for col in TEXT_COLUMNS:
+                if col in data.columns:
+                    data[col] = data[col].astype(TEXT_DTYPE)
 
         # --- MODIFICATION START ---
         # Conditionally filter leads based on the target country setting
         if settings.TARGET_COUNTRY == "USA":
             logger.info(f"Filtering enabled for target country: {settings.TARGET_COUNTRY}")
-            data = self._filter_usa_leads(data)
+            data = self._filter_usa_leads(data, file_has_usa_indicators)
         else:
             logger.info("Country filtering is disabled in settings.")
         # --- MODIFICATION END ---
 
-        data = data.drop_duplicates()
+        # Any full-row duplicate is also a username duplicate, so one keyed pass is enough
         data = data.drop_duplicates(subset=['username'], keep='first')
 
         if 'name' in data.columns:
-            data['name'] = data['name'].astype(str).str.title().replace('Nan', None)
+            # Missing names become None directly instead of round-tripping via 'Nan'
+            named = data['name'].notna()
+            data['name'] = as_text(data['name']).str.title().astype(object).where(named, None)
 
         if 'website' in data.columns:
             data['website'] = data['website'].apply(self._clean_website_url)
 
         if 'bio' in data.columns:
-            data['bio'] = data['bio'].astype(str).replace('nan', '')
-            data['phone_extracted'] = data['bio'].apply(self._extract_phone)
-            data['email_extracted'] = data['bio'].apply(self._extract_email)
+            data['bio'] = as_text(data['bio'])
+            data['phone_extracted'] = self._extract_match(data['bio'], PHONE_RE)
+            data['email_extracted'] = self._extract_match(data['bio'], EMAIL_RE)
 
         if 'category' in data.columns:
-            data['category'] = data['category'].astype(str).str.lower().replace('nan', '')
+            data['category'] = as_text(data['category']).str.lower()
 
         logger.info(f"Data cleaning complete. {len(data)} records processed.")
         return data
 
-    def _filter_usa_leads(self, data: pd.DataFrame) -> pd.DataFrame:
+    def _filter_usa_leads(self, data: pd.DataFrame, file_has_usa_indicators: Optional[bool] = None) -> pd.DataFrame:
         """Filter leads to keep only USA-based ones. (Your logic is great, no changes needed here)"""
         initial_count = len(data)
         if initial_count == 0:
             return data
 
-        # USA indicators patterns
-        usa_patterns = [
-            r'\b(USA|US|United States|America|American)\b',
-            r'\b(AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY)\b',
-            r'\b\d{5}(-\d{4})?\b',  # ZIP codes
-            r'\+?1[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US phone format
-            r'\b(California|Texas|Florida|New York|Illinois|Pennsylvania|Ohio|Georgia|North Carolina|Michigan)\b'
-        ]
-        usa_pattern = '|'.join(usa_patterns)
-
-        # Check multiple columns for USA indicators
-        text_columns = ['bio', 'category', 'name', 'website']
-        usa_mask = pd.Series([False] * len(data), index=data.index)
-
-        for col in text_columns:
-            if col in data.columns:
-                # Use .fillna('') to avoid errors on pure NaN columns
-                usa_mask |= data[col].fillna('').astype(str).str.contains(
-                    usa_pattern, case=False, na=False, regex=True
-                )
+        if not any(col in data.columns for col in TEXT_COLUMNS):
+            logger.warning("No text columns available for USA filtering - keeping all rows.")
+            return data
+
+        usa_mask = self.usa_indicator_mask(data)
+        if file_has_usa_indicators is None:
+            file_has_usa_indicators = bool(usa_mask.any())
 
         # If no clear indicators, assume leads are valid for the target country
-        if not usa_mask.any():
+        if not file_has_usa_indicators:
             logger.warning("No specific USA indicators found in any leads - keeping all rows.")
             return data
 
@@ -84,6 +120,35 @@ class DataCleaner:
         logger.info(f"USA filtering: {initial_count} -> {final_count} leads retained ({dropped_count} dropped).")
         return filtered_data
 
+    def usa_indicator_mask(self, data: pd.DataFrame) -> pd.Series:
+        """Boolean Series, aligned to data, flagging rows whose text columns mention a USA indicator."""
+        # Check multiple columns for USA indicators in a single pass over one joined string per row
+        text_columns = [col for col in TEXT_COLUMNS if col in data.columns]
+        if not text_columns or data.empty:
+            return pd.Series(False, index=data.index)
+
+        # as_text fills NaN with '' to avoid errors on pure NaN columns. The joined text is kept
+        # as plain Python strings so the match runs in Python's re: Arrow's (RE2) \b is ASCII-only,
+        # which would let 'reçus' match \bUS\b in the mostly French sample data.
+        texts = [as_text(data[col]).astype(object) for col in text_columns]
+        combined = texts[0].str.cat(texts[1:], sep=' ')
+        usa_mask = combined.str.contains(USA_PATTERN, na=False)
+        usa_mask = pd.Series(usa_mask.to_numpy(dtype=bool), index=data.index)
+
+        # Only rows without another indicator need the state-abbreviation lookup
+        unmatched = ~usa_mask.to_numpy()
+        if unmatched.any():
+            usa_mask[unmatched] = self._mentions_state_code(combined[unmatched])
+        return usa_mask
+
+    def _mentions_state_code(self, texts: pd.Series) -> np.ndarray:
+        """Flags texts containing a standalone US state abbreviation, positionally aligned to texts."""
+        texts = texts.reset_index(drop=True)
+        candidates = texts.str.extractall(STATE_CODE_CANDIDATE_RE)[0]
+        is_state = candidates.str.upper().isin(US_STATE_CODES)
+        flagged = is_state.groupby(level=0).any()
+        return flagged.reindex(texts.index, fill_value=False).to_numpy(dtype=bool)
+
     def _clean_website_url(self, url: str) -> Optional[str]:
         """Clean and validate website URLs."""
         if pd.isna(url) or str(url).lower() in ['nan', 'none', '']:
@@ -95,26 +160,7 @@ class DataCleaner:
             url = 'https://' + url
         return url.rstrip('/')
 
-    def _extract_phone(self, bio: str) -> Optional[str]:
-        """Extract USA phone number from bio."""
-        if pd.isna(bio):
-            return None
-        # Enhanced USA phone patterns
-        phone_patterns = [
-            r'\+?1[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\d{10}',
-        ]
-        for pattern in phone_patterns:
-            match = re.search(pattern, str(bio))
-            if match:
-                return match.group(0)
-        return None
-
-    def _extract_email(self, bio: str) -> Optional[str]:
-        """Extract email from bio."""
-        if pd.isna(bio):
-            return None
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, str(bio))
-        return match.group(0) if match else None
\ No newline at end of file
+    def _extract_match(self, texts: pd.Series, pattern: re.Pattern) -> pd.Series:
+        """Vectorized extraction of the first match of pattern, with None where there is none."""
+        extracted = texts.str.extract(pattern, expand=False)
+        return extracted.astype(object).where(extracted.notna(), None)
\ No newline at end of file
@@ -1,12 +1,28 @@
 # wholesale_lead_analyzer/data_processing/scorer.py
 
+import logging
+import multiprocessing
+import os
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from configs import settings
+from data_processing.cleaner import as_text
 from enrichment import email_validator, web_scraper, business_records, public_records
 from enrichment.social_media import SocialMediaAnalyzer # Import the class
 from utils.proxy_manager import ProxyManager # Import the class
+from utils.keyword_matcher import KeywordMatcher
+from utils.web_utils import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Contacts handed to a worker process per task by LeadScorer.score_dataframe
+SCORING_CHUNK_SIZE = 64
+
+ScoreResult = Tuple[int, List[str], Dict[str, int]]
 
 class LeadScorer:
     """Calculates a comprehensive lead score by orchestrating various analysis modules."""
@@ -21,70 +37,123 @@ class LeadScorer:
         """
         self.proxy_manager = proxy_manager
         self.social_media_analyzer = social_media_analyzer
+        self._stress_matcher = KeywordMatcher(settings.FINANCIAL_STRESS_KEYWORDS)
+        self._property_matcher = KeywordMatcher(settings.PROPERTY_KEYWORDS)
+        # (score, label, keywords), checked in order; the first tier with a keyword in the category wins
+        self._category_tiers = [
+            (25, "High-value", settings.HIGH_VALUE_CATEGORIES),
+            (15, "Medium-value", settings.MEDIUM_VALUE_CATEGORIES),
+            (10, "Lifestyle", settings.LIFESTYLE_CATEGORIES),
+        ]
 
     def analyze_bio(self, bio: str) -> Tuple[int, List[str]]:
         if pd.isna(bio) or not bio: return 0, []
         bio_lower = str(bio).lower()
-        score, reasons = 0, []
-
-        stress_score, stress_found = 0, []
-        for keyword in settings.FINANCIAL_STRESS_KEYWORDS:
-            if keyword in bio_lower:
-                stress_score += 3
-                stress_found.append(keyword)
-        stress_score = min(stress_score, 20)
+        reasons = []
+
+        stress_found = self._stress_matcher.find(bio_lower)
+        stress_score = min(3 * len(stress_found), 20)
         if stress_found: reasons.append(f"Financial stress indicators: {', '.join(stress_found)}")
 
-        property_score, property_found = 0, []
-        for keyword in settings.PROPERTY_KEYWORDS:
-            if keyword in bio_lower:
-                property_score += 3
-                property_found.append(keyword)
-        property_score = min(property_score, 20)
+        property_found = self._property_matcher.find(bio_lower)
+        property_score = min(3 * len(property_found), 20)
         if property_found: reasons.append(f"Property ownership indicators: {', '.join(property_found)}")
 
         return stress_score + property_score, reasons
 
+    def score_bios_vectorized(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Scores the whole 'bio' column at once, matching analyze_bio row for row.
+
+        Returns a DataFrame aligned to data with 'bio_score' and 'bio_reasons' columns,
+        which calculate_lead_score picks up instead of re-analyzing each bio.
+        """
+        if 'bio' in data.columns:
+            bios = as_text(data['bio']).str.lower()
+        else:
+            bios = pd.Series('', index=data.index)
+
+        stress_keywords = np.array(self._stress_matcher.keywords, dtype=object)
+        property_keywords = np.array(self._property_matcher.keywords, dtype=object)
+        stress_hits = self._keyword_hits(bios, stress_keywords)
+        property_hits = self._keyword_hits(bios, property_keywords)
+
+        bio_scores = (
+            np.minimum(3 * stress_hits.sum(axis=1), 20) + np.minimum(3 * property_hits.sum(axis=1), 20)
+        )
+        bio_reasons = []
+        for stress_row, property_row in zip(stress_hits, property_hits):
+            reasons = []
+            if stress_row.any():
+                reasons.append(f"Financial stress indicators: {', '.join(stress_keywords[stress_row])}")
+            if property_row.any():
+                reasons.append(f"Property ownership indicators: {', '.join(property_keywords[property_row])}")
+            bio_reasons.append(reasons)
+
+        return pd.DataFrame({'bio_score': bio_scores, 'bio_reasons': bio_reasons}, index=data.index)
+
+    def _keyword_hits(self, texts: pd.Series, keywords: np.ndarray) -> np.ndarray:
+        """Boolean matrix (rows x keywords) of substring hits, one vectorized scan per keyword."""
+        if not len(keywords):
+            return np.zeros((len(texts), 0), dtype=bool)
+        return np.column_stack([
+            texts.str.contains(keyword, regex=False).to_numpy(dtype=bool) for keyword in keywords
+        ])
+
     def analyze_category(self, category: str) -> Tuple[int, List[str]]:
         if pd.isna(category) or not category: return 0, []
         cat_lower = str(category).lower()
-        
-        if any(cat in cat_lower for cat in settings.HIGH_VALUE_CATEGORIES):
-            return 25, [f"High-value category: {category}"]
-        if any(cat in cat_lower for cat in settings.MEDIUM_VALUE_CATEGORIES):
-            return 15, [f"Medium-value category: {category}"]
-        if any(cat in cat_lower for cat in settings.LIFESTYLE_CATEGORIES):
-            return 10, [f"Lifestyle category: {category}"]
+
+        for score, label, keywords in self._category_tiers:
+            if any(cat in cat_lower for cat in keywords):
+                return score, [f"{label} category: {category}"]
         return 0, []
 
-    def calculate_lead_score(self, contact: pd.Series) -> Tuple[int, List[str], Dict[str, int]]:
+    def score_dataframe(self, data: pd.DataFrame,
+                        workers: Optional['ScoringWorkers'] = None) -> List[Union[ScoreResult, Exception]]:
+        """
+        Scores every contact in data, spreading chunks of rows across worker processes.
+
+        Pass the same ScoringWorkers to every call of one run so the worker processes, and the
+        caches they hold, are reused; without it a short-lived set of workers is started.
+        Returns one (score, reasons, component_scores) tuple per row, in row order,
+        or the exception raised while scoring that row.
+        """
+        if workers is None:
+            with ScoringWorkers(self) as workers:
+                return self.score_dataframe(data, workers)
+
+        data = data.join(self.score_bios_vectorized(data))
+        # Plain dicts are cheaper to pickle and to .get() from than per-row Series
+        records = data.to_dict(orient='records')
+        return workers.score(records)
+
+    def calculate_lead_score(self, contact: Union[pd.Series, Dict[str, Any]]) -> ScoreResult:
         """
         Calculates the lead score by calling enrichment functions with the necessary dependencies.
+        The contact may be a DataFrame row or a plain dict of the same fields.
         """
         all_reasons, scores = [], {}
 
-        # Bio & Category (no external requests)
-        scores['bio_score'], reasons = self.analyze_bio(contact.get('bio'))
+        # Bio & Category (no external requests). Bio scores may be precomputed by score_bios_vectorized.
+        if 'bio_score' in contact:
+            scores['bio_score'], reasons = int(contact.get('bio_score')), list(contact.get('bio_reasons'))
+        else:
+            scores['bio_score'], reasons = self.analyze_bio(contact.get('bio'))
         all_reasons.extend(reasons)
         scores['category_score'], reasons = self.analyze_category(contact.get('category'))
         all_reasons.extend(reasons)
 
-        # Website & Zillow Scraping (requires ProxyManager)
-        # We assume an 'address' column might exist for Zillow.
-        scores['zillow_score'], reasons = web_scraper.scrape_zillow_property_data(
-            contact.get('address'), self.proxy_manager
-        )
-        all_reasons.extend(reasons)
-        scores['website_score'], reasons = web_scraper.analyze_website(
-            contact.get('website'), self.proxy_manager
-        )
-        all_reasons.extend(reasons)
-        
-        # Social Media (requires SocialMediaAnalyzer, which uses ProxyManager)
-        scores['social_score'], reasons = self.social_media_analyzer.analyze_social_media_deep(
-            contact.get('username'), contact.get('name')
-        )
-        all_reasons.extend(reasons)
+        # Website, Zillow & Social Media (network-bound). Skipped when the cheap signals
+        # rule the lead out and there is no website or username to look up.
+        cheap_total = scores['bio_score'] + scores['category_score']
+        if (cheap_total < settings.ENRICHMENT_MIN_CHEAP_SCORE
+                and _is_blank(contact.get('website')) and _is_blank(contact.get('username'))):
+            scores.update(zillow_score=0, website_score=0, social_score=0)
+        else:
+            network_scores, reasons = self._analyze_network_sources(contact)
+            scores.update(network_scores)
+            all_reasons.extend(reasons)
 
         # Email Validation (no external requests)
         is_valid, reason = email_validator.validate_email_free(contact.get('email_extracted'))
@@ -102,4 +171,165 @@ class LeadScorer:
         all_reasons.extend(reasons)
         
         total_score = sum(scores.values())
-        return min(total_score, 100), all_reasons, scores
\ No newline at end of file
+        return min(total_score, 100), all_reasons, scores
+
+    def _analyze_network_sources(self, contact: Union[pd.Series, Dict[str, Any]]) -> Tuple[Dict[str, int], List[str]]:
+        """Runs the network-bound lookups concurrently, returning their scores and reasons in order."""
+        scores, all_reasons = {}, []
+        # We assume an 'address' column might exist for Zillow.
+        with ThreadPoolExecutor(max_workers=settings.ENRICHMENT_WORKERS) as executor:
+            zillow_future = executor.submit(
+                web_scraper.scrape_zillow_property_data, contact.get('address'), self.proxy_manager
+            )
+            website_future = executor.submit(
+                web_scraper.analyze_website, contact.get('website'), self.proxy_manager
+            )
+            social_future = executor.submit(
+                self.social_media_analyzer.analyze_social_media_deep, contact.get('username'), contact.get('name')
+            )
+
+            scores['zillow_score'], reasons = zillow_future.result()
+            all_reasons.extend(reasons)
+            scores['website_score'], reasons = website_future.result()
+            all_reasons.extend(reasons)
+            scores['social_score'], reasons = social_future.result()
+            all_reasons.extend(reasons)
+
+        return scores, all_reasons
+
+
+def _is_blank(value: Any) -> bool:
+    """True for None, NaN/NA (how pandas reads an empty CSV cell) and empty strings."""
+    return bool(pd.api.types.is_scalar(value) and pd.isna(value)) or not value
+
+
+class ScoringWorkers:
+    """
+    The worker processes LeadScorer.score_dataframe runs on, each holding its own copy of the scorer.
+
+    Every process keeps per-process caches (websites, social profiles), so contacts that share
+    a website, name or username are always sent to the same process, across all the
+    score_dataframe calls of a run, and only that process looks it up. Proxy failures and
+    reloads are shared between the processes' ProxyManager copies.
+    """
+
+    def __init__(self, scorer: LeadScorer, processes: Optional[int] = None):
+        processes = processes or settings.SCORING_PROCESSES or os.cpu_count() or 1
+        self._scorer = scorer
+        self._proxy_manager = scorer.proxy_manager
+        self._manager = multiprocessing.Manager()
+        self._proxy_manager.share_health(self._manager)
+        # One single-process pool per worker, so a task can be sent to a chosen process
+        self._executors = [self._start_worker() for _ in range(processes)]
+        self._affinity: Dict[Any, int] = {}  # routing key -> worker index
+        self._assigned = [0] * processes      # contacts sent to each worker so far
+
+    def __enter__(self) -> 'ScoringWorkers':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def shutdown(self):
+        for executor in self._executors:
+            executor.shutdown()
+        self._proxy_manager.share_health(None)
+        self._manager.shutdown()
+
+    def _start_worker(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=1, initializer=_init_scoring_worker, initargs=(self._scorer,))
+
+    def _restart_worker(self, worker: int, broken: ProcessPoolExecutor):
+        """Replaces a worker whose process died, unless that was already done for this executor."""
+        if self._executors[worker] is broken:
+            logger.error(f"Scoring worker {worker + 1} died; starting a new one.")
+            broken.shutdown(wait=False)
+            self._executors[worker] = self._start_worker()
+
+    def score(self, records: List[Dict[str, Any]]) -> List[Union[ScoreResult, Exception]]:
+        """
+        Scores records on the workers, in chunks of up to SCORING_CHUNK_SIZE, returning outcomes in row order.
+        If a worker process dies, its unfinished contacts are reported as failed and the worker is replaced.
+        """
+        total = len(records)
+        results: List[Union[ScoreResult, Exception, None]] = [None] * total
+        futures = {}
+        for worker, positions in enumerate(self._route(records)):
+            for start in range(0, len(positions), SCORING_CHUNK_SIZE):
+                chunk = positions[start:start + SCORING_CHUNK_SIZE]
+                executor = self._executors[worker]
+                try:
+                    future = executor.submit(_score_chunk, [records[i] for i in chunk], chunk, total)
+                except BrokenProcessPool:
+                    # Died while running an earlier chunk; that chunk is reported below
+                    self._restart_worker(worker, executor)
+                    executor = self._executors[worker]
+                    future = executor.submit(_score_chunk, [records[i] for i in chunk], chunk, total)
+                futures[future] = (worker, executor, chunk)
+
+        for future in as_completed(futures):
+            worker, executor, positions = futures[future]
+            try:
+                outcomes = future.result()
+            except Exception as e:
+                logger.error(f"Scoring worker failed for {len(positions)} contacts from {positions[0] + 1}: {e}")
+                outcomes = [e] * len(positions)
+                if isinstance(e, BrokenProcessPool):
+                    self._restart_worker(worker, executor)
+            for position, outcome in zip(positions, outcomes):
+                results[position] = outcome
+        return results
+
+    def _route(self, records: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Row positions for each worker, in row order. A contact follows any earlier contact
+        it shares a routing key with; otherwise it goes to the least busy worker.
+        """
+        routed: List[List[int]] = [[] for _ in self._executors]
+        for position, contact in enumerate(records):
+            keys = _routing_keys(contact)
+            worker = next((self._affinity[key] for key in keys if key in self._affinity), None)
+            if worker is None:
+                worker = min(range(len(self._executors)), key=self._assigned.__getitem__)
+            for key in keys:
+                self._affinity.setdefault(key, worker)
+            self._assigned[worker] += 1
+            routed[worker].append(position)
+        return routed
+
+
+def _routing_keys(contact: Dict[str, Any]) -> List[Any]:
+    """Values whose lookups are cached per process, so contacts sharing them should share a worker."""
+    keys = []
+    website = contact.get('website')
+    if isinstance(website, str) and website:
+        keys.append(('website', normalize_url(website)))
+    # Social profiles are cached by lower-cased username and name
+    for field in ('username', 'name'):
+        value = contact.get(field)
+        if isinstance(value, str) and value.strip():
+            keys.append((field, value.strip().lower()))
+    return keys
+
+
+# --- Worker-process side of LeadScorer.score_dataframe ---
+# Each worker keeps the scorer it was started with, so per-process caches survive across chunks.
+_worker_scorer: Optional[LeadScorer] = None
+
+def _init_scoring_worker(scorer: LeadScorer):
+    global _worker_scorer
+    _worker_scorer = scorer
+
+def _score_chunk(records: List[Dict[str, Any]], positions: List[int], total: int) -> List[Union[ScoreResult, Exception]]:
+    """Scores a chunk of contacts (at the given row positions) in a worker process, running contacts concurrently for I/O."""
+    def score_contact(position: int, contact: Dict[str, Any]) -> Union[ScoreResult, Exception]:
+        name = contact.get('name') or contact.get('username', f'Contact {position}')
+        logger.info(f"Processing {position}/{total}: {name}")
+        try:
+            return _worker_scorer.calculate_lead_score(contact)
+        except Exception as e:
+            logger.error(f"Critical error while processing contact {name}: {e}", exc_info=True)
+            return e
+
+    with ThreadPoolExecutor(max_workers=settings.CONTACT_WORKERS) as executor:
+        return list(executor.map(score_contact, (p + 1 for p in positions), records))
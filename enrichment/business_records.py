@@ -1,23 +1,34 @@
 # wholesale_lead_analyzer/enrichment/business_records.py
 
+import re
 import logging
+from functools import lru_cache
 from typing import List, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# Terms suggesting a real estate entity, matched anywhere in the name in one scan
+_REAL_ESTATE_ENTITY_RE = re.compile(r'properties|investments|realty|holdings', re.IGNORECASE)
+
 def check_business_registration(name: str, business_name: Optional[str] = None) -> Tuple[int, List[str]]:
     """(Placeholder) Check business registrations for LLC formations."""
     try:
-        score, reasons = 0, []
-        search_names = [s for s in [name, business_name] if s]
-        
-        for search_name in search_names:
-            # Placeholder for actual searches of Secretary of State websites
-            if any(term in search_name.lower() for term in ['properties', 'investments', 'realty', 'holdings']):
-                score += 8
-                reasons.append(f"Real estate business entity: {search_name}")
-        
-        return min(score, 15), reasons
+        score, reasons = _score_business_names(name, business_name)
+        return score, list(reasons)
     except Exception as e:
         logger.warning(f"Error checking business registration: {e}")
-        return 0, []
\ No newline at end of file
+        return 0, []
+
+@lru_cache(maxsize=8192)
+def _score_business_names(name: str, business_name: Optional[str]) -> Tuple[int, Tuple[str, ...]]:
+    """Scores a name pair; cached because batches repeat the same name/category pairs."""
+    score, reasons = 0, []
+    search_names = [s for s in [name, business_name] if s]
+
+    for search_name in search_names:
+        # Placeholder for actual searches of Secretary of State websites
+        if _REAL_ESTATE_ENTITY_RE.search(search_name):
+            score += 8
+            reasons.append(f"Real estate business entity: {search_name}")
+
+    return min(score, 15), tuple(reasons)
\ No newline at end of file
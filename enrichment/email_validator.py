@@ -4,17 +4,20 @@ import re
 from typing import Tuple
 from configs.settings import DISPOSABLE_DOMAINS
 
+# Set view of the configured list for O(1) membership checks
+_DISPOSABLE_DOMAINS = frozenset(domain.lower() for domain in DISPOSABLE_DOMAINS)
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 def validate_email_free(email: str) -> Tuple[bool, str]:
     """Free email validation using regex and domain check."""
     if not email:
         return False, "No email"
     
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, email):
+    if not _EMAIL_RE.match(email):
         return False, "Invalid format"
     
-    domain = email.split('@')[1].lower()
-    if domain in DISPOSABLE_DOMAINS:
+    domain = email.rpartition('@')[2].lower()
+    if domain in _DISPOSABLE_DOMAINS:
         return False, "Disposable email"
     
     return True, "Valid"
\ No newline at end of file
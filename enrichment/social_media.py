@@ -4,32 +4,53 @@ import requests
 import json
 import re
 import logging
-from typing import Tuple, List, Dict, Optional
-from bs4 import BeautifulSoup
+import threading
+from collections import OrderedDict
+from typing import Callable, Tuple, List, Dict, Optional
+from lxml import html as lxml_html
 from urllib.parse import quote
 
 from utils.proxy_manager import ProxyManager
-from utils.web_utils import get_random_user_agent, dynamic_sleep
+from utils.web_utils import get_random_user_agent, dynamic_sleep, create_session
+from utils.keyword_matcher import KeywordMatcher
 from configs import settings
 
 logger = logging.getLogger(__name__)
 
+# Instagram embeds profile data as JSON in a <script> tag; grab it without building a DOM
+_SHARED_DATA_RE = re.compile(r'window\._sharedData\s*=\s*(\{.*?\});\s*</script>', re.DOTALL)
+
+# Google result containers (div.g, div.MjjYud, div.sV3dd), matched by whole class token
+_RESULT_DIVS_XPATH = '//div[{}]'.format(' or '.join(
+    f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')" for cls in ('g', 'MjjYud', 'sV3dd')
+))
+_LINKEDIN_PROFILE_HREF_XPATH = "//a[contains(@href, 'https://www.linkedin.com/in/')]/@href"
+
+# Max number of profile results remembered per platform; bulk lists often repeat names.
+PROFILE_CACHE_SIZE = 4096
+
 # --- Robust Request Helper ---
+# Shared by every request in this process so connections are pooled and kept alive
+_SESSION = create_session()
+# Headers common to every request live on the session; only the User-Agent varies per call
+_SESSION.headers['Accept-Language'] = 'en-US,en;q=0.5'
+
 def _make_request(url: str, proxy_manager: ProxyManager) -> Optional[requests.Response]:
     """A robust helper function to make web requests using proxy rotation and rate limiting."""
     max_retries = 3
     for attempt in range(max_retries):
         dynamic_sleep()
         proxy = proxy_manager.get_proxy()
-        headers = {'User-Agent': get_random_user_agent(), 'Accept-Language': 'en-US,en;q=0.5'}
+        headers = {'User-Agent': get_random_user_agent()}
         try:
             logger.info(f"Requesting {url} (Attempt {attempt+1}) using proxy: {proxy['http'] if proxy else 'None'}")
-            response = requests.get(url, headers=headers, proxies=proxy, timeout=15)
+            response = _SESSION.get(url, headers=headers, proxies=proxy, timeout=15)
             response.raise_for_status()
+            proxy_manager.mark_proxy_success(proxy)
             return response
         except requests.exceptions.RequestException as e:
             logger.warning(f"Request to {url} failed: {e}")
-            proxy_manager.mark_current_proxy_failed()
+            proxy_manager.mark_proxy_failed(proxy)
     logger.error(f"All {max_retries} attempts failed for URL: {url}")
     return None
 
@@ -39,6 +60,31 @@ class SocialMediaAnalyzer:
 
     def __init__(self, proxy_manager: ProxyManager):
         self.proxy_manager = proxy_manager
+        self._username_matcher = KeywordMatcher(
+            ['realestate', 'property', 'homes', 'houses', 'investor', 'flip', 'rehab', 'realty']
+        )
+        self._instagram_bio_matcher = KeywordMatcher(settings.PROPERTY_KEYWORDS + settings.FINANCIAL_STRESS_KEYWORDS)
+        self._linkedin_matcher = KeywordMatcher([
+            'real estate', 'realtor', 'broker', 'property manager', 'investor', 'developer',
+            'landlord', 'flipper', 'wholesaler', 'construction', 'realty', 'acquisitions'
+        ])
+        # LRU caches of (score, reasons) keyed by normalized username / name
+        self._instagram_cache: OrderedDict = OrderedDict()
+        self._linkedin_cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Per-key locks so a name asked for by several threads at once is looked up once, capped like the caches
+        self._key_locks: OrderedDict = OrderedDict()
+
+    def __getstate__(self):
+        # Locks can't be pickled; worker processes get a fresh one
+        state = self.__dict__.copy()
+        del state['_cache_lock']
+        state['_key_locks'] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache_lock = threading.Lock()
 
     def analyze_social_media_deep(self, username: str, name: str) -> Tuple[int, List[str]]:
         """Orchestrates social media analysis based on settings, preserving all analysis steps."""
@@ -52,24 +98,58 @@ class SocialMediaAnalyzer:
 
         # Step 2: Analyze Instagram, if enabled
         if 'instagram' in settings.SOCIAL_PLATFORM_FOCUS and username:
-            ig_score, ig_reasons = self._scrape_instagram_profile(username)
+            ig_score, ig_reasons = self._cached(
+                self._instagram_cache, str(username).strip().lower(),
+                lambda: self._scrape_instagram_profile(username)
+            )
             total_score += ig_score
             all_reasons.extend(ig_reasons)
 
         # Step 3: Analyze LinkedIn, if enabled
         if 'linkedin' in settings.SOCIAL_PLATFORM_FOCUS and name:
-            li_score, li_reasons = self._search_and_scrape_linkedin(name)
+            li_score, li_reasons = self._cached(
+                self._linkedin_cache, str(name).strip().lower(),
+                lambda: self._search_and_scrape_linkedin(name)
+            )
             total_score += li_score
             all_reasons.extend(li_reasons)
 
         return min(total_score, 25), all_reasons
 
+    def _cached(self, cache: OrderedDict, key: str,
+                analyze: Callable[[], Tuple[int, List[str]]]) -> Tuple[int, List[str]]:
+        """Returns a remembered result for key, running analyze() only on a cache miss."""
+        with self._key_lock(cache, key):
+            with self._cache_lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    score, reasons = cache[key]
+                    return score, list(reasons)
+
+            score, reasons = analyze()
+            with self._cache_lock:
+                cache[key] = (score, tuple(reasons))
+                if len(cache) > PROFILE_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return score, list(reasons)
+
+    def _key_lock(self, cache: OrderedDict, key: str) -> threading.Lock:
+        lock_key = (id(cache), key)
+        with self._cache_lock:
+            lock = self._key_locks.get(lock_key)
+            if lock is None:
+                lock = self._key_locks[lock_key] = threading.Lock()
+                if len(self._key_locks) > 2 * PROFILE_CACHE_SIZE:
+                    self._key_locks.popitem(last=False)
+            else:
+                self._key_locks.move_to_end(lock_key)
+            return lock
+
     def _analyze_username(self, username: str) -> Tuple[int, List[str]]:
         """Analyzes username for real estate and business indicators. (Your original logic)."""
         username_lower = str(username).lower()
         score, reasons = 0, []
-        re_terms = ['realestate', 'property', 'homes', 'houses', 'investor', 'flip', 'rehab', 'realty']
-        found_terms = [term for term in re_terms if term in username_lower]
+        found_terms = self._username_matcher.find(username_lower)
         if found_terms:
             score += 4
             reasons.append(f"Real estate username indicator(s): {', '.join(found_terms)}")
@@ -84,15 +164,12 @@ class SocialMediaAnalyzer:
             return 0, [f"Instagram profile for {username} not accessible"]
 
         try:
-            # Use a more robust method to find the JSON data
-            soup = BeautifulSoup(response.text, 'html.parser')
-            script = soup.find('script', text=re.compile(r'window\._sharedData'))
-            if not script:
+            match = _SHARED_DATA_RE.search(response.text)
+            if not match:
                 logger.warning(f"Could not find JSON data script on Instagram page for {username}.")
                 return 0, ["Could not parse Instagram profile"]
-            
-            json_text = script.string.replace('window._sharedData =', '').rstrip(';')
-            data = json.loads(json_text)
+
+            data = json.loads(match.group(1))
             profile = data.get('entry_data', {}).get('ProfilePage', [{}])[0].get('graphql', {}).get('user', {})
 
             if not profile:
@@ -101,8 +178,7 @@ class SocialMediaAnalyzer:
             score, reasons = 0, []
             bio = profile.get('biography', '').lower()
             if bio:
-                bio_keywords = settings.PROPERTY_KEYWORDS + settings.FINANCIAL_STRESS_KEYWORDS
-                found_terms = [k for k in bio_keywords if k in bio]
+                found_terms = self._instagram_bio_matcher.find(bio)
                 if found_terms:
                     score += 5
                     reasons.append(f"Instagram bio keywords: {', '.join(found_terms[:3])}")
@@ -146,25 +222,21 @@ class SocialMediaAnalyzer:
 
     def _analyze_linkedin_search_results(self, html_content: str) -> Tuple[int, List[str], Optional[str]]:
         """Analyzes Google search results for LinkedIn profile info and extracts the top URL."""
+        if not html_content or not html_content.strip():
+            return 0, [], None
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            search_results_text = " ".join(div.get_text().lower() for div in soup.select("div.g, div.MjjYud, div.sV3dd"))
+            tree = lxml_html.fromstring(html_content)
+            search_results_text = " ".join(div.text_content().lower() for div in tree.xpath(_RESULT_DIVS_XPATH))
             
             score, reasons = 0, []
-            re_keywords = [
-                'real estate', 'realtor', 'broker', 'property manager', 'investor', 'developer', 
-                'landlord', 'flipper', 'wholesaler', 'construction', 'realty', 'acquisitions'
-            ]
-            found_keywords = [k for k in re_keywords if k in search_results_text]
+            found_keywords = self._linkedin_matcher.find(search_results_text)
             if found_keywords:
                 score += 5
                 reasons.append(f"LinkedIn search indicators: {', '.join(found_keywords[:3])}")
             
             # Extract the first valid LinkedIn profile URL
-            profile_url = None
-            link_tag = soup.find('a', href=re.compile(r'https://www.linkedin.com/in/'))
-            if link_tag:
-                profile_url = link_tag['href']
+            hrefs = tree.xpath(_LINKEDIN_PROFILE_HREF_XPATH)
+            profile_url = hrefs[0] if hrefs else None
 
             return score, reasons, profile_url
         except Exception as e:
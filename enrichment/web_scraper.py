@@ -1,26 +1,52 @@
 # wholesale_lead_analyzer/enrichment/web_scraper.py
 
 import requests
+import os
 import re
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Tuple, Optional
-from bs4 import BeautifulSoup
 from urllib.parse import quote
 import random 
 
-from utils.web_utils import get_random_user_agent, dynamic_sleep
+from utils.web_utils import get_random_user_agent, dynamic_sleep, create_session, normalize_url
 from utils.proxy_manager import ProxyManager
+from utils.keyword_matcher import KeywordMatcher
 from configs import settings
 
 logger = logging.getLogger(__name__)
 
+# Shared by every request in one process so connections are pooled and kept alive,
+# with pages cached on disk across runs when requests-cache is available; see _session
+_SESSION: Optional[requests.Session] = None
+_SESSION_PID: Optional[int] = None
+_SESSION_LOCK = threading.Lock()
+
+# Max number of website results remembered per process; leads often share a website.
+WEBSITE_CACHE_SIZE = 2048
+# Website results by normalized URL, least recently used first
+_WEBSITE_MEMO: 'OrderedDict[str, Tuple[int, Tuple[str, ...]]]' = OrderedDict()
+# Per-URL locks, capped like the memo; evicting one in use at worst lets a second fetch through
+_URL_LOCKS: 'OrderedDict[str, threading.Lock]' = OrderedDict()
+_URL_LOCKS_GUARD = threading.Lock()
+
+# Website keywords found in one pass over the page's HTML
+_WEBSITE_KEYWORD_MATCHER = KeywordMatcher(k.lower() for k in settings.WEBSITE_KEYWORDS)
+# Property-related words that make a contact form count, checked in a single regex pass
+_CONTACT_WORDS_RE = re.compile('|'.join(map(re.escape, ['contact', 'quote', 'sell', 'buy'])))
+
 def _make_request(url: str, proxy_manager: ProxyManager, headers: Optional[dict] = None) -> Optional[requests.Response]:
     """A robust helper function to make web requests using proxy rotation and rate limiting."""
     max_retries = 3
-    if headers is None:
-        headers = {'User-Agent': get_random_user_agent()}
-    else:
-        headers.setdefault('User-Agent', get_random_user_agent())
+    # Never mutate the caller's headers; only pick a user agent when they don't set one
+    if not headers or 'User-Agent' not in headers:
+        headers = {'User-Agent': get_random_user_agent(), **(headers or {})}
+
+    # A page already in the on-disk cache needs no rate limiting or proxy
+    cached = _cached_response(url, headers)
+    if cached is not None:
+        return cached
 
     for attempt in range(max_retries):
         dynamic_sleep()
@@ -28,16 +54,47 @@ def _make_request(url: str, proxy_manager: ProxyManager, headers: Optional[dict]
 
         try:
             logger.info(f"Requesting {url} (Attempt {attempt+1}) using proxy: {proxy['http'] if proxy else 'None'}")
-            response = requests.get(url, headers=headers, proxies=proxy, timeout=15)
+            response = _session().get(url, headers=headers, proxies=proxy, timeout=15)
             response.raise_for_status()
+            proxy_manager.mark_proxy_success(proxy)
             return response
         except requests.exceptions.RequestException as e:
             logger.warning(f"Request to {url} failed: {e}")
-            proxy_manager.mark_current_proxy_failed()
+            proxy_manager.mark_proxy_failed(proxy)
             
     logger.error(f"All {max_retries} attempts failed for URL: {url}")
     return None
 
+def _session() -> requests.Session:
+    """
+    This process's shared session, created on first use. Scoring workers are forked from the
+    main process, so each one opens its own connections and on-disk cache instead of inheriting them.
+    """
+    global _SESSION, _SESSION_PID
+    pid = os.getpid()
+    if _SESSION_PID != pid:
+        with _SESSION_LOCK:
+            if _SESSION_PID != pid:
+                session = create_session(cache_name=settings.WEB_CACHE_PATH,
+                                         expire_hours=settings.WEB_CACHE_EXPIRE_HOURS)
+                # Headers common to every request live on the session; only the User-Agent varies per call
+                session.headers.update({'Accept': '*/*', 'Accept-Language': 'en-US,en;q=0.9'})
+                _SESSION, _SESSION_PID = session, pid
+    return _SESSION
+
+def _cached_response(url: str, headers: dict) -> Optional[requests.Response]:
+    """The session's fresh cached response for url, or None if it isn't cached (or caching is off)."""
+    session = _session()
+    if not hasattr(session, 'cache'):
+        return None
+    try:
+        # requests-cache answers 504 instead of going to the network when it has nothing
+        response = session.get(url, headers=headers, only_if_cached=True)
+    except requests.exceptions.RequestException:
+        # e.g. a malformed URL; the request itself will fail and be reported the usual way
+        return None
+    return response if response.status_code == 200 else None
+
 ##def scrape_zillow_property_data(address: str, proxy_manager: ProxyManager) -> Tuple[int, List[str]]:
 ##    """Scrapes Zillow using its internal API for reliable data."""
 ##    if not address:
@@ -115,30 +172,62 @@ def analyze_website(url: str, proxy_manager: ProxyManager) -> Tuple[int, List[st
     """Scrape and analyze a lead's website using the robust request handler."""
     if not url:
         return 0, []
-        
+    # The normalized URL only keys the memo; the page is fetched from the URL as given
+    key = normalize_url(url)
+    # One fetch per URL even when several threads ask for it at once; the rest wait for the memo
+    with _url_lock(key):
+        result = _lru_get(_WEBSITE_MEMO, key)
+        if result is None:
+            result = _fetch_and_score_website(url, proxy_manager)
+            _lru_put(_WEBSITE_MEMO, key, result)
+    score, reasons = result
+    return score, list(reasons)
+
+def _url_lock(key: str) -> threading.Lock:
+    lock = _lru_get(_URL_LOCKS, key)
+    # Another thread may have added one in between; _lru_put keeps theirs
+    return lock if lock is not None else _lru_put(_URL_LOCKS, key, threading.Lock())
+
+def _lru_get(table: OrderedDict, key: str):
+    with _URL_LOCKS_GUARD:
+        value = table.get(key)
+        if value is not None:
+            table.move_to_end(key)
+        return value
+
+def _lru_put(table: OrderedDict, key: str, value):
+    """Stores value under key, dropping the least recently used entry past WEBSITE_CACHE_SIZE."""
+    with _URL_LOCKS_GUARD:
+        value = table.setdefault(key, value)
+        table.move_to_end(key)
+        if len(table) > WEBSITE_CACHE_SIZE:
+            table.popitem(last=False)
+        return value
+
+def _fetch_and_score_website(url: str, proxy_manager: ProxyManager) -> Tuple[int, Tuple[str, ...]]:
+    """analyze_website without the memo; reasons are a tuple so memoized results stay immutable."""
     response = _make_request(url, proxy_manager)
     if not response:
-        return 0, [f"Website analysis failed: Could not retrieve {url}"]
+        return 0, (f"Website analysis failed: Could not retrieve {url}",)
 
     try:
-        soup = BeautifulSoup(response.content, 'html.parser')
-        text_content = soup.get_text().lower()
-        score, reasons, found_keywords = 0, [], []
-        
-        for keyword in settings.WEBSITE_KEYWORDS:
-            if keyword in text_content:
-                score += 3
-                found_keywords.append(keyword)
-        
-        if soup.find('form') and any(w in text_content for w in ['contact', 'quote', 'sell', 'buy']):
-            score += 5
-            reasons.append("Contact form with property-related content")
-        
-        if found_keywords:
-            reasons.append(f"Website keywords found: {', '.join(found_keywords[:5])}")
-            
-        return min(score, 25), reasons
-        
+        return _score_html(response.text)
     except Exception as e:
         logger.error(f"Error parsing website content for {url}: {e}")
-        return 0, [f"Website analysis failed: Parsing error"]
\ No newline at end of file
+        return 0, (f"Website analysis failed: Parsing error",)
+
+def _score_html(html: str) -> Tuple[int, Tuple[str, ...]]:
+    """Scores a fetched page's HTML. Pure CPU work with no I/O, kept at module level so it can run in any process."""
+    # Scan the decoded HTML directly instead of building a parse tree for get_text()
+    text_content = html.lower()
+    found_keywords = _WEBSITE_KEYWORD_MATCHER.find(text_content)
+    score, reasons = 3 * len(found_keywords), []
+
+    if '<form' in text_content and _CONTACT_WORDS_RE.search(text_content):
+        score += 5
+        reasons.append("Contact form with property-related content")
+
+    if found_keywords:
+        reasons.append(f"Website keywords found: {', '.join(found_keywords[:5])}")
+
+    return min(score, 25), tuple(reasons)
@@ -4,23 +4,27 @@ import pandas as pd
 import argparse
 import logging
 from datetime import datetime
+from typing import Optional
 
 # Import all our custom components
-from data_processing.cleaner import DataCleaner
-from data_processing.scorer import LeadScorer
+from data_processing.cleaner import DataCleaner, TEXT_COLUMNS
+from data_processing.scorer import LeadScorer, ScoringWorkers
 from output.report_generator import ReportGenerator
 from enrichment.social_media import SocialMediaAnalyzer
 from utils.proxy_manager import ProxyManager
-from utils.classification import classify_lead
+from configs import settings
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
-def process_wholesale_leads(input_csv_path: str, output_csv_path: str, delimiter: str = '\t') -> pd.DataFrame:
-    """Main function to orchestrate the lead processing workflow."""
+def process_wholesale_leads(input_csv_path: str, output_csv_path: str, delimiter: str = '\t',
+                            hot_leads_path: Optional[str] = None, report_path: Optional[str] = None) -> pd.DataFrame:
+    """Main function to orchestrate the lead processing workflow, optionally also exporting hot leads and a text report."""
     logger.info(f"Starting lead processing from {input_csv_path}")
+    # Every result of this run shares one analysis date
+    run_ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     # --- MODIFICATION START: Instantiate components with dependencies ---
     logger.info("Initializing analysis components...")
@@ -39,57 +43,63 @@ def process_wholesale_leads(input_csv_path: str, output_csv_path: str, delimiter
     reporter = ReportGenerator()
     # --- MODIFICATION END ---
 
-    # Load and clean data
+    # Load, clean and score the input in chunks
     try:
-        raw_data = pd.read_csv(input_csv_path, sep=delimiter)
-        logger.info(f"Loaded {len(raw_data)} records.")
+        reader = pd.read_csv(input_csv_path, sep=delimiter, chunksize=settings.INPUT_CHUNK_SIZE, dtype=str)
+        # The USA filter keeps every row when no row of the file has an indicator, so decide that up front
+        file_has_usa_indicators = (_file_has_usa_indicators(input_csv_path, delimiter, cleaner)
+                                   if settings.TARGET_COUNTRY == "USA" else None)
     except Exception as e:
         logger.error(f"Failed to read input file {input_csv_path}: {e}")
         raise
-        
-    cleaned_data = cleaner.clean_contact_data(raw_data)
-    if cleaned_data.empty:
+
+    chunk_results, seen_usernames = [], set()
+    # One set of scoring processes for the whole run, so their caches carry across chunks
+    with reader, ScoringWorkers(scorer) as workers:
+        for raw_data in reader:
+            logger.info(f"Loaded {len(raw_data)} records.")
+            cleaned_data = cleaner.clean_contact_data(raw_data, file_has_usa_indicators)
+            # The cleaner only de-duplicates within a chunk; drop usernames seen in earlier chunks
+            cleaned_data = cleaned_data[~cleaned_data['username'].isin(seen_usernames)]
+            seen_usernames.update(cleaned_data['username'])
+            if cleaned_data.empty:
+                continue
+
+            # Score contacts across worker processes; results come back in row order
+            outcomes = scorer.score_dataframe(cleaned_data, workers)
+            chunk_results.append(reporter.build_results_frame(cleaned_data, outcomes, analysis_date=run_ts))
+
+    if not chunk_results:
         logger.warning("No leads remaining after cleaning and filtering. Exiting.")
         return pd.DataFrame()
-    
-    # Process each contact
-    results = []
-    total = len(cleaned_data)
-    for index, contact in cleaned_data.iterrows():
-        try:
-            name = contact.get('name') or contact.get('username', f'Contact {index+1}')
-            logger.info(f"Processing {index+1}/{total}: {name}")
-            
-            # The scorer now has everything it needs to perform deep analysis
-            score, reasons, components = scorer.calculate_lead_score(contact)
-            classification = classify_lead(score)
-            
-            result_record = reporter.build_result_record(contact, score, classification, reasons, components)
-            results.append(result_record)
-            
-            # Note: The dynamic_sleep is now handled within the scraper functions,
-            # so we no longer need a sleep call here in the main loop.
-            
-        except Exception as e:
-            logger.error(f"Critical error while processing contact {name}: {e}", exc_info=True)
-            results.append({
-                'original_username': contact.get('username', ''), 'lead_score': 0,
-                'lead_classification': 'ERROR', 'scoring_reasons': f'Processing error: {e}',
-                'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            })
-            
+
     # Finalize and save results
-    results_df = pd.DataFrame(results).sort_values('lead_score', ascending=False)
+    # Stable sort: leads with equal scores keep their input order
+    results_df = pd.concat(chunk_results, ignore_index=True).sort_values(
+        'lead_score', ascending=False, kind='stable', ignore_index=True)
     results_df.to_csv(output_csv_path, index=False)
     logger.info(f"Results saved to {output_csv_path}")
     
     # Validate and summarize
     validation_report = reporter.validate_results(results_df)
     logger.info(f"Validation report: {validation_report}")
-    reporter.print_summary(results_df)
+    # Counted once for the console summary, hot-lead export and report
+    summary = reporter.summarize(results_df)
+    reporter.print_summary(results_df, summary)
+    if hot_leads_path:
+        reporter.export_hot_leads(results_df, hot_leads_path, summary)
+    if report_path:
+        reporter.generate_report(results_df, report_path, summary)
     
     return results_df
 
+def _file_has_usa_indicators(input_csv_path: str, delimiter: str, cleaner: DataCleaner) -> bool:
+    """Whether any row of the input mentions a USA indicator, reading only the text columns and stopping at the first hit."""
+    reader = pd.read_csv(input_csv_path, sep=delimiter, chunksize=settings.INPUT_CHUNK_SIZE, dtype=str,
+                         usecols=lambda column: column in TEXT_COLUMNS)
+    with reader:
+        return any(cleaner.usa_indicator_mask(chunk).any() for chunk in reader)
+
 def main():
     """Main execution function with command line interface."""
     parser = argparse.ArgumentParser(description='Wholesale Lead Analyzer with Free Data Enrichment')
@@ -101,14 +111,8 @@ def main():
     args = parser.parse_args()
     
     try:
-        results_df = process_wholesale_leads(args.input_file, args.output_file, args.delimiter)
-        
-        if not results_df.empty:
-            reporter = ReportGenerator()
-            if args.hot_leads_file:
-                reporter.export_hot_leads(results_df, args.hot_leads_file)
-            if args.report_file:
-                reporter.generate_report(results_df, args.report_file)
+        process_wholesale_leads(args.input_file, args.output_file, args.delimiter,
+                                hot_leads_path=args.hot_leads_file, report_path=args.report_file)
             
         print(f"\n✅ Processing complete! Results saved to {args.output_file}")
         
@@ -1,42 +1,92 @@
 # wholesale_lead_analyzer/output/report_generator.py
 
+import csv
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import logging
-from typing import Dict, List, Any
-from utils.classification import estimate_probability
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple, Union
+from utils.classification import classify_leads, estimate_probabilities
 
 logger = logging.getLogger(__name__)
 
+# Scoring reasons whose detail lists indicator keywords, by the text before ": "
+INDICATOR_REASON_HEADS = {
+    "Financial stress indicators": 'financial',
+    "Property ownership indicators": 'property',
+}
+
+class LeadSummary(NamedTuple):
+    """Classification counts and HOT leads of a results DataFrame, see ReportGenerator.summarize."""
+    total: int
+    counts: pd.Series  # leads per classification, most common first
+    hot_leads: pd.DataFrame
+
 class ReportGenerator:
     """Handles all output, including CSVs, reports, and summaries."""
 
-    def build_result_record(self, contact: pd.Series, score: int, classification: str, 
-                            reasons: List[str], component_scores: Dict[str, int]) -> Dict:
-        """Build the final dictionary for the output DataFrame."""
+    # Contact fields copied into the output, as (output column, input column)
+    CONTACT_COLUMNS = [
+        ('original_username', 'username'), ('cleaned_name', 'name'),
+        ('phone_extracted', 'phone_extracted'), ('email_extracted', 'email_extracted'),
+        ('original_bio', 'bio'), ('original_category', 'category'), ('cleaned_website', 'website'),
+    ]
+
+    def build_results_frame(self, contacts: pd.DataFrame,
+                            outcomes: List[Union[Tuple[int, List[str], Dict[str, int]], Exception]],
+                            analysis_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Build the output DataFrame for all contacts at once from their scoring outcomes.
+
+        outcomes holds one (score, reasons, component_scores) tuple per contact, in row order,
+        or the exception raised while scoring it; failed rows are reported as ERROR.
+        analysis_date stamps every row, defaulting to now; pass the run's start time to
+        give all chunks of one run the same date.
+        """
+        failed = np.array([isinstance(outcome, Exception) for outcome in outcomes], dtype=bool)
+        scored = ~failed
+        scores = np.fromiter((0 if bad else outcome[0] for bad, outcome in zip(failed, outcomes)),
+                             dtype=np.int32, count=len(outcomes))
+        reasons = [[] if bad else outcome[1] for bad, outcome in zip(failed, outcomes)]
+        components = pd.DataFrame([{} if bad else outcome[2] for bad, outcome in zip(failed, outcomes)])
+
+        classifications = classify_leads(scores)
+        probabilities = estimate_probabilities(scores)
+        priorities = np.select([classifications == 'HOT', classifications == 'WARM'], [1, 2], 3).astype(np.int8)
+
         financial_indicators, property_indicators = [], []
-        for reason in reasons:
-            if "Financial stress" in reason: financial_indicators.append(reason.split(": ")[1])
-            elif "Property ownership" in reason: property_indicators.append(reason.split(": ")[1])
-        
-        return {
-            'original_username': contact.get('username', ''),
-            'cleaned_name': contact.get('name', ''),
-            'phone_extracted': contact.get('phone_extracted', ''),
-            'email_extracted': contact.get('email_extracted', ''),
-            'original_bio': contact.get('bio', ''),
-            'original_category': contact.get('category', ''),
-            'cleaned_website': contact.get('website', ''),
-            'lead_score': score,
-            'lead_classification': classification,
-            'scoring_reasons': ' | '.join(reasons),
-            **component_scores, # Unpack all component scores
-            'financial_stress_indicators': ', '.join(financial_indicators),
-            'property_ownership_indicators': ', '.join(property_indicators),
-            'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'follow_up_priority': 1 if classification == "HOT" else 2 if classification == "WARM" else 3,
-            'estimated_probability': estimate_probability(score)
-        }
+        for row_reasons in reasons:
+            found = {'financial': [], 'property': []}
+            for reason in row_reasons:
+                head, sep, detail = reason.partition(": ")
+                indicator = INDICATOR_REASON_HEADS.get(head) if sep else None
+                if indicator: found[indicator].append(detail)
+            financial_indicators.append(', '.join(found['financial']))
+            property_indicators.append(', '.join(found['property']))
+
+        contacts = contacts.reset_index(drop=True)
+        results = pd.DataFrame(index=contacts.index)
+        for output_column, input_column in self.CONTACT_COLUMNS:
+            if input_column in contacts:
+                values = contacts[input_column].astype(object)
+            else:
+                values = pd.Series('', index=contacts.index, dtype=object)
+            # Failed rows only report the username
+            results[output_column] = values if output_column == 'original_username' else values.where(scored)
+        results['lead_score'] = scores
+        results['lead_classification'] = np.where(failed, 'ERROR', classifications)
+        results['scoring_reasons'] = [
+            f'Processing error: {outcome}' if bad else ' | '.join(row_reasons)
+            for bad, outcome, row_reasons in zip(failed, outcomes, reasons)
+        ]
+        results = pd.concat([results, components], axis=1)
+        results['financial_stress_indicators'] = pd.Series(financial_indicators, dtype=object).where(scored)
+        results['property_ownership_indicators'] = pd.Series(property_indicators, dtype=object).where(scored)
+        results['analysis_date'] = analysis_date or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Failed rows have no priority, which needs a float column for NaN
+        results['follow_up_priority'] = pd.Series(priorities, dtype=float).where(scored) if failed.any() else priorities
+        results['estimated_probability'] = pd.Series(probabilities, dtype=object).where(scored)
+        return results
 
     def validate_results(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Performs quality checks on the final results."""
@@ -48,14 +98,24 @@ class ReportGenerator:
             'score_stats': df['lead_score'].describe().to_dict()
         }
 
-    def print_summary(self, df: pd.DataFrame):
+    def summarize(self, df: pd.DataFrame) -> LeadSummary:
+        """
+        Counts and HOT leads of df, computed once. Pass the result to print_summary,
+        export_hot_leads and generate_report so they don't each recount the results.
+        """
+        classifications = df['lead_classification']
+        return LeadSummary(len(df), classifications.value_counts(), df[classifications == 'HOT'])
+
+    def print_summary(self, df: pd.DataFrame, summary: Optional[LeadSummary] = None):
         """Prints a summary of the analysis to the console."""
         print("\n" + "="*70 + "\nENHANCED WHOLESALE LEAD SCORING SUMMARY\n" + "="*70)
-        total = len(df)
+        if summary is None:
+            summary = self.summarize(df)
+        total = summary.total
         print(f"Total Leads Processed: {total}")
         
         print("\nLead Classifications:")
-        for cls, count in df['lead_classification'].value_counts().items():
+        for cls, count in summary.counts.items():
             print(f"  {cls}: {count} ({(count / total) * 100:.1f}%)")
 
         print("\nTop 5 Leads:")
@@ -63,32 +123,44 @@ class ReportGenerator:
             print(f"  {lead['cleaned_name'] or lead['original_username']}: {lead['lead_score']} ({lead['lead_classification']})")
         print("="*70)
 
-    def export_hot_leads(self, df: pd.DataFrame, path: str):
+    def export_hot_leads(self, df: pd.DataFrame, path: str, summary: Optional[LeadSummary] = None):
         """Exports only HOT leads to a separate CSV."""
-        hot_leads = df[df['lead_classification'] == 'HOT'].copy()
+        if summary is None:
+            summary = self.summarize(df)
+        hot_leads = summary.hot_leads
         if not hot_leads.empty:
             cols = [
                 'cleaned_name', 'phone_extracted', 'email_extracted', 'lead_score', 
                 'financial_stress_indicators', 'property_ownership_indicators', 
                 'scoring_reasons', 'follow_up_priority', 'estimated_probability'
             ]
-            hot_leads[cols].to_csv(path, index=False)
+            # Usually a handful of rows, so skip pandas' CSV machinery; missing values are written
+            # blank as each row goes out, without copying the columns first
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(cols)
+                writer.writerows(
+                    ['' if pd.isna(value) else value for value in row]
+                    for row in zip(*(hot_leads[col] for col in cols))
+                )
             logger.info(f"Exported {len(hot_leads)} hot leads to {path}")
         else:
             logger.info("No hot leads found to export.")
 
-    def generate_report(self, df: pd.DataFrame, path: str):
+    def generate_report(self, df: pd.DataFrame, path: str, summary: Optional[LeadSummary] = None):
         """Generates a simple text file report."""
         try:
+            if summary is None:
+                summary = self.summarize(df)
             with open(path, 'w') as f:
                 f.write(f"WHOLESALE LEAD ANALYSIS REPORT\n{'='*50}\n\n")
                 f.write(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Total Leads Analyzed: {len(df)}\n\n")
+                f.write(f"Total Leads Analyzed: {summary.total}\n\n")
                 f.write("LEAD CLASSIFICATION SUMMARY:\n" + "-"*30 + "\n")
-                for cls, count in df['lead_classification'].value_counts().items():
-                    f.write(f"{cls}: {count} leads ({(count / len(df)) * 100:.1f}%)\n")
+                for cls, count in summary.counts.items():
+                    f.write(f"{cls}: {count} leads ({(count / summary.total) * 100:.1f}%)\n")
                 
-                hot_leads = df[df['lead_classification'] == 'HOT']
+                hot_leads = summary.hot_leads
                 if not hot_leads.empty:
                     f.write(f"\nHOT LEADS (Top Priority):\n" + "-"*30 + "\n")
                     for _, lead in hot_leads.iterrows():
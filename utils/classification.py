@@ -1,23 +1,30 @@
 # wholesale_lead_analyzer/utils/classification.py
 
+import numpy as np
+from bisect import bisect_right
+
+# Score thresholds shared by the scalar and array versions; a score at a bin edge
+# belongs to the higher bucket (e.g. 70 is HOT).
+_BINS = (30, 50, 70)
+_LABELS = ('UNLIKELY', 'COLD', 'WARM', 'HOT')
+_PROBABILITIES = ('Low (0-30%)', 'Medium (30-50%)', 'Medium-High (50-70%)', 'High (70-90%)')
+
+_BINS_ARRAY = np.array(_BINS)
+_LABELS_ARRAY = np.array(_LABELS, dtype=object)
+_PROBABILITIES_ARRAY = np.array(_PROBABILITIES, dtype=object)
+
 def classify_lead(score: int) -> str:
     """Classify leads based on score."""
-    if score >= 70:
-        return "HOT"
-    elif score >= 50:
-        return "WARM"
-    elif score >= 30:
-        return "COLD"
-    else:
-        return "UNLIKELY"
+    return _LABELS[bisect_right(_BINS, score)]
 
 def estimate_probability(score: int) -> str:
     """Estimate probability of being a motivated seller."""
-    if score >= 70:
-        return "High (70-90%)"
-    elif score >= 50:
-        return "Medium-High (50-70%)"
-    elif score >= 30:
-        return "Medium (30-50%)"
-    else:
-        return "Low (0-30%)"
\ No newline at end of file
+    return _PROBABILITIES[bisect_right(_BINS, score)]
+
+def classify_leads(scores: np.ndarray) -> np.ndarray:
+    """classify_lead for a whole array of scores."""
+    return _LABELS_ARRAY[np.searchsorted(_BINS_ARRAY, scores, side='right')]
+
+def estimate_probabilities(scores: np.ndarray) -> np.ndarray:
+    """estimate_probability for a whole array of scores."""
+    return _PROBABILITIES_ARRAY[np.searchsorted(_BINS_ARRAY, scores, side='right')]
@@ -0,0 +1,29 @@
+# wholesale_lead_analyzer/utils/keyword_matcher.py
+
+from typing import Iterable, List
+
+try:
+    import ahocorasick  # Optional: pyahocorasick finds every keyword in a single pass
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """Finds which keywords from a fixed list occur as substrings of a text."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self._positions = {keyword: i for i, keyword in enumerate(self.keywords)}
+        self._automaton = None
+        if ahocorasick is not None and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+
+    def find(self, text: str) -> List[str]:
+        """Returns the keywords present in text, in the order they were given."""
+        if self._automaton is None:
+            return [keyword for keyword in self.keywords if keyword in text]
+        found = {keyword for _, keyword in self._automaton.iter(text)}
+        return sorted(found, key=self._positions.__getitem__)
\ No newline at end of file
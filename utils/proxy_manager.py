@@ -3,12 +3,24 @@
 import requests
 import random
 import logging
-from typing import List, Dict, Optional, Tuple
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, List, Dict, NamedTuple, Optional, Tuple
 from configs import settings
-from utils.web_utils import dynamic_sleep # Use the centralized rate limiter
+from utils.web_utils import dynamic_sleep, create_session # Use the centralized rate limiter
 
 logger = logging.getLogger(__name__)
 
+# Free proxies tested at the same time while loading
+PROXY_TEST_WORKERS = 50
+
+class SharedProxyHealth(NamedTuple):
+    """Proxy health shared by the copies of one ProxyManager in several processes (multiprocessing.Manager objects)."""
+    failed: Any  # dict: proxy URL -> generation it failed in
+    state: Any   # dict: 'generation' and the 'proxies' list of the latest load
+    lock: Any    # held while a process reloads proxies
+
 class ProxyManager:
     """Manages proxy loading, rotation, and USA geo-filtering for web scraping."""
 
@@ -20,10 +32,28 @@ class ProxyManager:
         it can fall back to loading free proxies from the web.
         """
         self.proxies: List[Dict[str, str]] = []
-        self.current_proxy_index = 0
         self.failed_proxies = set()
+        # Indices of healthy proxies; the head is the next one handed out
+        self._ready: deque = deque()
+        # Proxy URL -> index in self.proxies, so callers can report back the proxy they used
+        self._positions: Dict[str, int] = {}
+        # Proxy rotation state is shared by every scraping thread
+        self._lock = threading.RLock()
+        # Failures and reloads seen by other processes, see share_health; generation counts reloads
+        self._shared: Optional[SharedProxyHealth] = None
+        self._generation = 0
         self.load_proxies(use_free_proxies_as_fallback)
 
+    def __getstate__(self):
+        # Locks can't be pickled; worker processes get a fresh one
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
     def load_proxies(self, use_free_proxies_as_fallback: bool):
         """
         Loads proxies, prioritizing the list from settings.py.
@@ -37,6 +67,28 @@ class ProxyManager:
             self._load_and_filter_free_proxies()
         else:
             logger.warning("No proxies configured in settings.py and fallback is disabled. Running without proxies.")
+        self._reset_rotation()
+
+    def _reset_rotation(self):
+        self.failed_proxies.clear()
+        self._ready = deque(range(len(self.proxies)))
+        self._positions = {proxy['http']: i for i, proxy in enumerate(self.proxies)}
+
+    def share_health(self, manager: Optional[Any]):
+        """
+        Shares proxy failures and reloads with the copies of this ProxyManager that other
+        processes get, through a started multiprocessing.Manager. Call it before handing the
+        ProxyManager to the processes; pass None to stop sharing once the manager is shut down.
+        """
+        with self._lock:
+            if manager is None:
+                self._shared = None
+                return
+            self._shared = SharedProxyHealth(
+                failed=manager.dict(),
+                state=manager.dict(generation=self._generation, proxies=self.proxies),
+                lock=manager.Lock(),
+            )
 
     def _load_and_filter_free_proxies(self):
         """Loads and filters free proxies from public sources."""
@@ -46,47 +98,57 @@ class ProxyManager:
             'https://api.proxyscrape.com/v2/?request=getproxies&protocol=http&timeout=10000&country=all&ssl=all&anonymity=all'
         ]
         all_proxies = []
-        for source in proxy_sources:
-            try:
-                response = requests.get(source, timeout=10)
-                if response.status_code == 200:
-                    proxy_list = [p.strip() for p in response.text.strip().split('\n') if ':' in p]
-                    all_proxies.extend(proxy_list)
-                    logger.info(f"Loaded {len(proxy_list)} potential proxies from {source}")
-            except Exception as e:
-                logger.warning(f"Failed to load proxies from {source}: {e}")
-
-        # Test and filter proxies for the target country from settings
-        if settings.TARGET_COUNTRY == "USA":
-            logger.info("Filtering for working USA proxies...")
-            self.proxies = self._filter_proxies_by_country(all_proxies, "United States")
-            logger.info(f"Found {len(self.proxies)} working USA proxies.")
-        else:
-            # If target is not USA, just grab some working ones without country check
-            self.proxies = self._filter_proxies_by_country(all_proxies, None)
-            logger.info(f"Found {len(self.proxies)} working generic proxies.")
-
-
-    def _filter_proxies_by_country(self, proxy_list: List[str], country_name: Optional[str]) -> List[Dict[str, str]]:
+        # A session local to this load: it is closed before scoring forks worker processes
+        with create_session(pool_size=PROXY_TEST_WORKERS) as session:
+            for source in proxy_sources:
+                try:
+                    response = session.get(source, timeout=10)
+                    if response.status_code == 200:
+                        proxy_list = [p.strip() for p in response.text.strip().split('\n') if ':' in p]
+                        all_proxies.extend(proxy_list)
+                        logger.info(f"Loaded {len(proxy_list)} potential proxies from {source}")
+                except Exception as e:
+                    logger.warning(f"Failed to load proxies from {source}: {e}")
+
+            # Test and filter proxies for the target country from settings
+            if settings.TARGET_COUNTRY == "USA":
+                logger.info("Filtering for working USA proxies...")
+                self.proxies = self._filter_proxies_by_country(all_proxies, "United States", session)
+                logger.info(f"Found {len(self.proxies)} working USA proxies.")
+            else:
+                # If target is not USA, just grab some working ones without country check
+                self.proxies = self._filter_proxies_by_country(all_proxies, None, session)
+                logger.info(f"Found {len(self.proxies)} working generic proxies.")
+
+
+    def _filter_proxies_by_country(self, proxy_list: List[str], country_name: Optional[str],
+                                   session: requests.Session) -> List[Dict[str, str]]:
         """Tests proxies and keeps only those based in the specified country."""
         working_proxies = []
         random.shuffle(proxy_list) # Test a random sample
 
-        for proxy_str in proxy_list[:200]: # Test a max of 200 to save time
-            proxy_dict = {"http": f'http://{proxy_str}', "https": f'http://{proxy_str}'}
-            is_valid, proxy_country = self._test_proxy(proxy_dict)
-
-            if is_valid and (country_name is None or proxy_country == country_name):
-                working_proxies.append(proxy_dict)
-                if len(working_proxies) >= 25:  # Stop after finding 25 good proxies
-                    break
+        # Test a max of 200 to save time, PROXY_TEST_WORKERS at once; the session's pool matches
+        with ThreadPoolExecutor(max_workers=PROXY_TEST_WORKERS) as executor:
+            futures = {
+                executor.submit(self._test_proxy, {"http": f'http://{p}', "https": f'http://{p}'}, session): p
+                for p in proxy_list[:200]
+            }
+            for future in as_completed(futures):
+                is_valid, proxy_country = future.result()
+                if is_valid and (country_name is None or proxy_country == country_name):
+                    proxy_str = futures[future]
+                    working_proxies.append({"http": f'http://{proxy_str}', "https": f'http://{proxy_str}'})
+                    if len(working_proxies) >= 25:  # Stop after finding 25 good proxies
+                        for pending in futures:
+                            pending.cancel()
+                        break
         return working_proxies
 
-    def _test_proxy(self, proxy: Dict[str, str]) -> Tuple[bool, Optional[str]]:
+    def _test_proxy(self, proxy: Dict[str, str], session: requests.Session) -> Tuple[bool, Optional[str]]:
         """Tests if a proxy works and returns its country."""
         try:
             # ip-api is a good, free service for this
-            response = requests.get('http://ip-api.com/json', proxies=proxy, timeout=5)
+            response = session.get('http://ip-api.com/json', proxies=proxy, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 return data.get('status') == 'success', data.get('country')
@@ -100,30 +162,72 @@ class ProxyManager:
         Gets a working proxy from the list, rotating if necessary.
         This is the main method other modules should call.
         """
-        if not self.proxies:
-            return None
-
-        # Rotate to the next available proxy, skipping failed ones
-        for _ in range(len(self.proxies)):
-            proxy_candidate = self.proxies[self.current_proxy_index]
-            if self.current_proxy_index not in self.failed_proxies:
-                return proxy_candidate
-            self._rotate_proxy()
-
-        # If all proxies have failed, try reloading them
-        logger.error("All proxies have failed. Attempting to reload.")
-        self.failed_proxies.clear()
-        self.load_proxies(use_free_proxies_as_fallback=True)
-        return self.proxies[0] if self.proxies else None
-
-    def _rotate_proxy(self):
-        """Rotates to the next proxy in the list."""
-        self.current_proxy_index = (self.current_proxy_index + 1) % len(self.proxies)
-
-    def mark_current_proxy_failed(self):
-        """Marks the currently used proxy as failed and rotates to the next one."""
-        if not self.proxies:
+        with self._lock:
+            if not self.proxies:
+                return None
+
+            # Failed proxies are dropped from the ready queue, so its head is usable
+            # unless another process has reported it failed since
+            if self._shared is not None:
+                self._drop_shared_failures()
+            if not self._ready:
+                self._reload()
+                if not self._ready:
+                    return None
+            return self.proxies[self._ready[0]]
+
+    def _drop_shared_failures(self):
+        failed = {url for url, generation in self._shared.failed.items() if generation == self._generation}
+        while self._ready and self.proxies[self._ready[0]]['http'] in failed:
+            self.failed_proxies.add(self._ready.popleft())
+
+    def _reload(self):
+        """Reloads proxies once every proxy has failed; shared copies reuse another process's reload."""
+        if self._shared is None:
+            logger.error("All proxies have failed. Attempting to reload.")
+            self.load_proxies(use_free_proxies_as_fallback=True)
             return
-        logger.warning(f"Marking proxy {self.proxies[self.current_proxy_index]} as failed.")
-        self.failed_proxies.add(self.current_proxy_index)
-        self._rotate_proxy()
\ No newline at end of file
+
+        with self._shared.lock:
+            state = self._shared.state
+            if state['generation'] > self._generation:
+                logger.info("All proxies have failed. Using the proxies another process reloaded.")
+                self.proxies = list(state['proxies'])
+                self._reset_rotation()
+            else:
+                logger.error("All proxies have failed. Attempting to reload.")
+                self.load_proxies(use_free_proxies_as_fallback=True)
+                state.update(generation=self._generation + 1, proxies=self.proxies)
+            self._generation = state['generation']
+
+    def mark_proxy_success(self, proxy: Optional[Dict[str, str]]):
+        """
+        Records a successful request through proxy. If it is still next in line, it moves
+        to the back of the queue so healthy proxies share the load.
+        """
+        with self._lock:
+            index = self._position_of(proxy)
+            if index is not None and self._ready and self._ready[0] == index:
+                self._ready.rotate(-1)
+
+    def mark_proxy_failed(self, proxy: Optional[Dict[str, str]]):
+        """Marks the proxy a request went through as failed and removes it from rotation."""
+        with self._lock:
+            index = self._position_of(proxy)
+            if index is None or index in self.failed_proxies:
+                return
+            logger.warning(f"Marking proxy {proxy} as failed.")
+            self.failed_proxies.add(index)
+            try:
+                self._ready.remove(index)
+            except ValueError:
+                pass
+            if self._shared is not None:
+                self._shared.failed[proxy['http']] = self._generation
+
+    def _position_of(self, proxy: Optional[Dict[str, str]]) -> Optional[int]:
+        """Index of proxy in the current list, or None if it is unknown (e.g. from before a reload)."""
+        if not proxy:
+            return None
+        index = self._positions.get(proxy['http'])
+        return index if index is not None and self.proxies[index] == proxy else None
@@ -4,6 +4,8 @@ import time
 import random
 import logging
 from collections import defaultdict, deque
+from functools import lru_cache
+from urllib.parse import urlsplit
 from typing import Dict, Optional
 from datetime import datetime, timedelta
 
@@ -11,10 +13,14 @@ logger = logging.getLogger(__name__)
 
 class RateLimiter:
     """Manages request timing to prevent blacklisting."""
+
+    # Requests per minute for domains without their own entry in domain_limits
+    _DOMAIN_LIMITS_DEFAULT = 10
     
     def __init__(self):
-        # Track requests per domain
-        self.domain_requests: Dict[str, deque] = defaultdict(deque)
+        # Monotonic timestamps of each domain's most recent requests, at most its limit
+        # (see _request_window); older ones fall off the front automatically.
+        self.domain_requests: Dict[str, deque] = {}
         
         # Rate limits per domain (requests per minute)
         self.domain_limits = {
@@ -23,21 +29,27 @@ class RateLimiter:
             'linkedin.com': 8,
             'facebook.com': 5,
             'google.com': 12,
-            'default': 10
+            'default': self._DOMAIN_LIMITS_DEFAULT
         }
         
         # Backoff tracking
         self.backoff_until: Dict[str, datetime] = {}
         self.consecutive_failures: Dict[str, int] = defaultdict(int)
         
-    def get_domain(self, url: str) -> str:
-        """Extract domain from URL."""
-        if '//' in url:
-            domain = url.split('/')[2]
-        else:
-            domain = url.split('/')[0]
-        return domain.lower()
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def get_domain(url: str) -> str:
+        """Extract domain from URL, with or without a scheme. Cached, as each URL is looked up several times."""
+        return urlsplit(url).netloc.lower() or urlsplit('//' + url).netloc.lower()
     
+    def _request_window(self, domain: str) -> deque:
+        """The domain's request timestamps, created on first use with room for exactly its limit."""
+        window = self.domain_requests.get(domain)
+        if window is None:
+            limit = self.domain_limits.get(domain, self._DOMAIN_LIMITS_DEFAULT)
+            window = self.domain_requests[domain] = deque(maxlen=limit)
+        return window
+
     def can_make_request(self, url: str) -> bool:
         """Check if request can be made without hitting rate limits."""
         domain = self.get_domain(url)
@@ -49,15 +61,9 @@ class RateLimiter:
             else:
                 del self.backoff_until[domain]
         
-        # Clean old requests (older than 1 minute)
-        now = time.time()
-        while (self.domain_requests[domain] and 
-               now - self.domain_requests[domain][0] > 60):
-            self.domain_requests[domain].popleft()
-        
-        # Check rate limit
-        limit = self.domain_limits.get(domain, self.domain_limits['default'])
-        return len(self.domain_requests[domain]) < limit
+        # Under the limit unless the window is full and its oldest request is within the last minute
+        window = self._request_window(domain)
+        return len(window) < window.maxlen or time.monotonic() - window[0] > 60
     
     def wait_if_needed(self, url: str) -> float:
         """Wait if necessary to respect rate limits."""
@@ -73,9 +79,9 @@ class RateLimiter:
                     return wait_time
             
             # Wait for rate limit window
-            if self.domain_requests[domain]:
-                oldest_request = self.domain_requests[domain][0]
-                wait_time = 60 - (time.time() - oldest_request)
+            window = self._request_window(domain)
+            if window:
+                wait_time = 60 - (time.monotonic() - window[0])
                 if wait_time > 0:
                     logger.info(f"Rate limiting {domain} for {wait_time:.1f}s")
                     time.sleep(wait_time)
@@ -86,7 +92,7 @@ class RateLimiter:
         time.sleep(random_delay)
         
         # Record this request
-        self.domain_requests[domain].append(time.time())
+        self._request_window(domain).append(time.monotonic())
         
         return random_delay
     
@@ -149,6 +155,7 @@ class RateLimiter:
     def get_status_report(self) -> Dict:
         """Get current rate limiting status."""
         now = datetime.now()
+        minute_ago = time.monotonic() - 60
         report = {
             'active_domains': len(self.domain_requests),
             'domains_in_backoff': len([d for d, until in self.backoff_until.items() 
@@ -158,7 +165,7 @@ class RateLimiter:
         }
         
         for domain in self.domain_requests:
-            recent_requests = len(self.domain_requests[domain])
+            recent_requests = sum(1 for t in self.domain_requests[domain] if t > minute_ago)
             in_backoff = domain in self.backoff_until and self.backoff_until[domain] > now
             
             report['domain_status'][domain] = {
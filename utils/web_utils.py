@@ -2,11 +2,68 @@
 
 import time
 import random
+import itertools
+import threading
+import requests
+from datetime import timedelta
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from requests.adapters import HTTPAdapter
 from configs import settings
 
+try:
+    import requests_cache  # Optional: persistent HTTP response cache
+except ImportError:
+    requests_cache = None
+
+# Query parameters that only track where a click came from, not what page it is
+_TRACKING_PARAMS = frozenset({'fbclid', 'gclid', 'igshid', 'mc_cid', 'mc_eid'})
+
+# Round-robin over the configured user agents, shared by every scraping thread
+_UA_CYCLE = itertools.cycle(settings.USER_AGENTS)
+_UA_LOCK = threading.Lock()
+
 def get_random_user_agent() -> str:
-    """Returns a random user-agent string from settings."""
-    return random.choice(settings.USER_AGENTS)
+    """Returns the next user-agent string from settings, rotating evenly through them."""
+    with _UA_LOCK:
+        return next(_UA_CYCLE)
+
+def create_session(pool_size: int = 50, cache_name: Optional[str] = None,
+                   expire_hours: Optional[float] = None) -> requests.Session:
+    """
+    Returns a requests.Session whose pooled keep-alive connections are reused
+    across calls, so repeat requests to a host skip the TCP/TLS handshake.
+
+    If cache_name is given and requests-cache is installed, successful responses are
+    also cached in a SQLite file of that name, honoring Cache-Control and ETags.
+    """
+    if cache_name and requests_cache is not None:
+        session = requests_cache.CachedSession(
+            cache_name, backend='sqlite', cache_control=True, allowable_codes=(200,), stale_if_error=True,
+            expire_after=timedelta(hours=expire_hours) if expire_hours is not None else -1,
+        )
+    else:
+        session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of url for caching: lower-cased scheme and host, no fragment or tracking params.
+    Text that doesn't parse as a URL (e.g. '[link in bio]') is only stripped and lower-cased.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip().lower()
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in _TRACKING_PARAMS
+    ]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ''))
 
 def dynamic_sleep():
     """